@@ -5,22 +5,23 @@ Refactored for efficiency and clean code practices.
 
 import streamlit as st
 import os
-from PIL import Image, ImageOps
-from io import BytesIO
-import base64
 from typing import Tuple, Optional
 import logging
 
-from core.services.UserService import UserService
+from core.services.UserService import UserService, EMAIL_PATTERN, USERNAME_PATTERN
 from core.services.EmailService import EmailService
 from core import initialize_session_state
 from core.utils.load_css import load_custom_css
+from core.utils.load_image import get_page_icon
 from core.utils.cookies import get_cookie_manager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Berkas di folder static/ dilayani langsung oleh Streamlit (server.enableStaticServing)
+STATIC_URL_PREFIX = "app/static"
+
 
 class MainPageManager:
     """
@@ -68,12 +69,9 @@ class MainPageManager:
         """Configure Streamlit page settings and branding."""
         try:
             st.logo("static/image/logo_iconplus.png", size="large")
-            logo = Image.open("static/image/icon.png").resize((40, 50))
-            logo_with_padding = ImageOps.expand(
-                logo, border=8, fill=(255, 255, 255, 0))
             st.set_page_config(
                 page_title="ICONNET Assistant",
-                page_icon=logo_with_padding,
+                page_icon=get_page_icon(),
                 layout="centered",
                 initial_sidebar_state="collapsed"
             )
@@ -93,38 +91,21 @@ class MainPageManager:
         else:
             logger.warning(f"Custom CSS file not found at {css_path}")
 
-    @staticmethod
-    def image_to_base64(image: Image.Image) -> str:
-        """
-        Mengonversi gambar ke format base64 untuk ditampilkan di Streamlit.
-        """
-        try:
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            # Return the full data URI scheme
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            return f"data:image/png;base64,{img_str}"
-        except Exception as e:
-            logger.error(f"Error converting image to base64: {e}")
-            return ""  # Kembalikan string kosong jika error
-
     def display_header(self) -> None:
         """Display application header with logo and title."""
         try:
             # Centered Logo
             logo_home_path = "static/image/logo_Iconnet.png"
             if os.path.exists(logo_home_path):
-                logo_home = Image.open(logo_home_path)
-                logo_base64 = MainPageManager.image_to_base64(logo_home)
-                if logo_base64:  # Pastikan konversi berhasil
-                    st.markdown(
-                        f"""
-                        <div style="text-align: center; padding-bottom: 10px;">
-                            <img src="{logo_base64}" alt="ICONNET Logo" style="width: 100%; max-width: 400px;">
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
-                    )
+                logo_url = f"{STATIC_URL_PREFIX}/image/logo_Iconnet.png"
+                st.markdown(
+                    f"""
+                    <div style="text-align: center; padding-bottom: 10px;">
+                        <img src="{logo_url}" alt="ICONNET Logo" style="width: 100%; max-width: 400px;">
+                    </div>
+                    """,
+                    unsafe_allow_html=True,
+                )
             else:
                 logger.warning(f"Main logo file not found: {logo_home_path}")
 
@@ -284,8 +265,7 @@ class MainPageManager:
                 return
 
             # Check for valid username characters (alphanumeric and underscore only)
-            import re
-            if not re.match(r'^[a-zA-Z0-9_]+$', username):
+            if not USERNAME_PATTERN.match(username):
                 st.error(
                     "Username can only contain letters, numbers, and underscores.")
                 return
@@ -309,8 +289,7 @@ class MainPageManager:
                 return
 
             # Basic email format validation
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, email):
+            if not EMAIL_PATTERN.match(email):
                 st.error("Please enter a valid email address.")
                 return
 
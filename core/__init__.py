@@ -11,7 +11,7 @@ from .utils.cloud_config import configure_for_cloud, is_streamlit_cloud
 # Import services
 from .services.UserService import UserService
 from .services.UserDataService import UserDataService
-from .services.EmailService import EmailService
+from .services.EmailService import get_email_service
 from .services.RAG import RAGService
 from .services.AssetDataService import AssetDataService
 from .services.SessionStorageService import get_session_storage_service
@@ -146,12 +146,7 @@ def initialize_session_state() -> bool:
             # Initialize EmailService
             if smtp_ready and "email_service" not in st.session_state:
                 try:
-                    st.session_state.email_service = EmailService(
-                        smtp_server=st.secrets["smtp"]["server"],
-                        smtp_port=st.secrets["smtp"]["port"],
-                        smtp_username=st.secrets["smtp"]["username"],
-                        smtp_password=st.secrets["smtp"]["password"]
-                    )
+                    st.session_state.email_service = get_email_service()
                     logger.info("EmailService initialized")
                 except Exception as e:
                     logger.error(f"Failed to initialize EmailService: {e}")
@@ -25,7 +25,7 @@ class AssetDataService:
     Enhanced with intelligent caching for better performance.
     """
 
-    def __init__(self, db_pool: pool.SimpleConnectionPool):
+    def __init__(self, db_pool: pool.ThreadedConnectionPool):
         """
         Initializes the AssetDataService.
 
@@ -4,41 +4,16 @@ Handles session persistence using multiple storage mechanisms with cloud-optimiz
 """
 
 import streamlit as st
-import json
+import orjson
 import logging
-import hashlib
 import uuid
+import weakref
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Union
 import base64
 
-# Try different storage mechanisms
-HAS_JS_EVAL = False
-HAS_EXTRA_STREAMLIT = False
-HAS_COOKIES_MANAGER = False
-
-try:
-    from streamlit_js_eval import streamlit_js_eval
-    HAS_JS_EVAL = True
-    logger = logging.getLogger(__name__)
-    logger.info("streamlit-js-eval available")
-except ImportError:
-    logger = logging.getLogger(__name__)
-    logger.warning("streamlit-js-eval not available")
-
-try:
-    import extra_streamlit_components as stx
-    HAS_EXTRA_STREAMLIT = True
-    logger.info("extra-streamlit-components available")
-except ImportError:
-    logger.warning("extra-streamlit-components not available")
-
-try:
-    from streamlit_cookies_manager import EncryptedCookieManager
-    HAS_COOKIES_MANAGER = True
-    logger.info("streamlit-cookies-manager available")
-except ImportError:
-    logger.warning("streamlit-cookies-manager not available")
+logger = logging.getLogger(__name__)
 
 
 class CloudSessionStorage:
@@ -51,6 +26,9 @@ class CloudSessionStorage:
         self.db_pool = db_pool
         self.app_prefix = app_prefix
         self.session_timeout = timedelta(days=7)
+        self._db_initialized = False
+        # Pooled connections that already hold the PREPAREd statements below
+        self._prepared_conns = weakref.WeakSet()
 
         # Initialize available storage mechanisms
         self._init_storage_mechanisms()
@@ -59,34 +37,45 @@ class CloudSessionStorage:
         """Initialize available storage mechanisms based on what's available."""
         self.storage_methods = []
 
+        # Storage components are imported here rather than at module level,
+        # so importing this module stays cheap for callers that never build it
+
         # Method 1: extra-streamlit-components cookie manager (most reliable for cloud)
-        if HAS_EXTRA_STREAMLIT:
-            try:
-                self.stx_cookie_manager = stx.CookieManager()
-                self.storage_methods.append("stx_cookies")
-                logger.info("STX Cookie Manager initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize STX Cookie Manager: {e}")
+        try:
+            import extra_streamlit_components as stx
+            self.stx_cookie_manager = stx.CookieManager()
+            self.storage_methods.append("stx_cookies")
+            logger.info("STX Cookie Manager initialized")
+        except ImportError:
+            logger.warning("extra-streamlit-components not available")
+        except Exception as e:
+            logger.error(f"Failed to initialize STX Cookie Manager: {e}")
 
         # Method 2: legacy cookies manager (fallback)
-        if HAS_COOKIES_MANAGER:
-            try:
-                cookie_password = st.secrets.get(
-                    "cookie_password", "iconnet_secure_key_2024")
-                self.legacy_cookies = EncryptedCookieManager(
-                    prefix=f"{self.app_prefix}_legacy",
-                    password=cookie_password
-                )
-                if self.legacy_cookies.ready():
-                    self.storage_methods.append("legacy_cookies")
-                    logger.info("Legacy cookies initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize legacy cookies: {e}")
+        try:
+            from streamlit_cookies_manager import EncryptedCookieManager
+            cookie_password = st.secrets.get(
+                "cookie_password", "iconnet_secure_key_2024")
+            self.legacy_cookies = EncryptedCookieManager(
+                prefix=f"{self.app_prefix}_legacy",
+                password=cookie_password
+            )
+            if self.legacy_cookies.ready():
+                self.storage_methods.append("legacy_cookies")
+                logger.info("Legacy cookies initialized")
+        except ImportError:
+            logger.warning("streamlit-cookies-manager not available")
+        except Exception as e:
+            logger.error(f"Failed to initialize legacy cookies: {e}")
 
         # Method 3: Browser localStorage via JS eval
-        if HAS_JS_EVAL:
+        try:
+            from streamlit_js_eval import streamlit_js_eval
+            self._js_eval = streamlit_js_eval
             self.storage_methods.append("js_local_storage")
             logger.info("JS LocalStorage available")
+        except ImportError:
+            logger.warning("streamlit-js-eval not available")
 
         # Method 4: Database storage (always available if db_pool exists)
         if self.db_pool:
@@ -100,14 +89,15 @@ class CloudSessionStorage:
 
     def save_session(self, username: str, email: str, role: str) -> bool:
         """Save user session using all available storage mechanisms."""
+        now = datetime.now()
         session_data = {
             "username": username,
             "email": email,
             "role": role,
             "signout": False,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "session_id": self._generate_session_id(username),
-            "expires_at": (datetime.now() + self.session_timeout).isoformat()
+            "expires_at": (now + self.session_timeout).isoformat()
         }
 
         success_count = 0
@@ -149,6 +139,11 @@ class CloudSessionStorage:
 
     def load_session(self) -> Optional[Dict[str, Any]]:
         """Load user session from available storage mechanisms."""
+        # Already logged in this browser session: skip cookie/JS/DB probes
+        session_data = self._load_session_state()
+        if session_data and self._is_session_valid(session_data):
+            return session_data
+
         # Try loading from each method in priority order
         for method in self.storage_methods:
             try:
@@ -224,8 +219,10 @@ class CloudSessionStorage:
     def _save_stx_cookies(self, session_data: Dict[str, Any]) -> bool:
         """Save session using extra-streamlit-components cookie manager."""
         try:
-            encoded_data = base64.b64encode(
-                json.dumps(session_data).encode()).decode()
+            # URL-safe base64 without padding: the cookie library percent-encodes
+            # values, and this alphabet passes through it unchanged
+            encoded_data = base64.urlsafe_b64encode(
+                orjson.dumps(session_data)).rstrip(b"=").decode('ascii')
 
             # Use STX cookie manager with expiry
             expires_at = datetime.now() + self.session_timeout
@@ -246,9 +243,10 @@ class CloudSessionStorage:
             encoded_data = self.stx_cookie_manager.get(
                 f"{self.app_prefix}_session")
             if encoded_data:
-                session_data = json.loads(
-                    base64.b64decode(encoded_data).decode())
-                return session_data
+                # Restore the stripped padding; standard base64 cookies written
+                # before the switch decode the same way
+                return orjson.loads(base64.urlsafe_b64decode(
+                    encoded_data + "=" * (-len(encoded_data) % 4)))
         except Exception as e:
             logger.error(f"STX cookie load failed: {e}")
         return None
@@ -269,8 +267,9 @@ class CloudSessionStorage:
             if not self.legacy_cookies.ready():
                 return False
 
-            for key, value in session_data.items():
-                self.legacy_cookies[key] = str(value)
+            # Store the whole session as one cookie: one encrypt, one header
+            self.legacy_cookies["session"] = base64.b64encode(
+                orjson.dumps(session_data)).decode('ascii')
             self.legacy_cookies.save()
             return True
         except Exception as e:
@@ -283,17 +282,11 @@ class CloudSessionStorage:
             if not self.legacy_cookies.ready():
                 return None
 
-            session_data = {}
-            for key in ["username", "email", "role", "signout", "timestamp", "session_id", "expires_at"]:
-                value = self.legacy_cookies.get(key)
-                if value:
-                    session_data[key] = value
-
-            if session_data.get("username"):
-                # Convert signout to boolean
-                session_data["signout"] = session_data.get(
-                    "signout", "True") == "True"
-                return session_data
+            encoded_data = self.legacy_cookies.get("session")
+            if encoded_data:
+                session_data = orjson.loads(base64.b64decode(encoded_data))
+                if session_data.get("username"):
+                    return session_data
         except Exception as e:
             logger.error(f"Legacy cookie load failed: {e}")
         return None
@@ -304,8 +297,7 @@ class CloudSessionStorage:
             if not self.legacy_cookies.ready():
                 return False
 
-            for key in ["username", "email", "role", "signout", "timestamp", "session_id", "expires_at"]:
-                self.legacy_cookies[key] = ""
+            self.legacy_cookies["session"] = ""
             self.legacy_cookies.save()
             return True
         except Exception as e:
@@ -318,7 +310,7 @@ class CloudSessionStorage:
         try:
             js_code = f"""
             try {{
-                const sessionData = {json.dumps(session_data)};
+                const sessionData = {orjson.dumps(session_data).decode()};
                 localStorage.setItem('{self.app_prefix}_session', JSON.stringify(sessionData));
                 localStorage.setItem('{self.app_prefix}_timestamp', Date.now().toString());
                 true;
@@ -327,7 +319,7 @@ class CloudSessionStorage:
                 false;
             }}
             """
-            result = streamlit_js_eval(js_expressions=js_code)
+            result = self._js_eval(js_expressions=js_code)
             return result is True
         except Exception as e:
             logger.error(f"JS localStorage save failed: {e}")
@@ -348,7 +340,7 @@ class CloudSessionStorage:
                 return null;
             }}
             """
-            result = streamlit_js_eval(js_expressions=js_code)
+            result = self._js_eval(js_expressions=js_code)
             return result if isinstance(result, dict) else None
         except Exception as e:
             logger.error(f"JS localStorage load failed: {e}")
@@ -367,71 +359,118 @@ class CloudSessionStorage:
                 false;
             }}
             """
-            result = streamlit_js_eval(js_expressions=js_code)
+            result = self._js_eval(js_expressions=js_code)
             return result is True
         except Exception as e:
             logger.error(f"JS localStorage clear failed: {e}")
             return False
 
     # Database Implementation
+    @contextmanager
+    def _db_cursor(self):
+        """
+        Borrow a pooled connection for one unit of work.
+
+        Commits on success, rolls back on error and always returns the
+        connection to the pool, so callers only deal with the cursor.
+        """
+        conn = self.db_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_pool.putconn(conn)
+
+    def _init_database(self) -> bool:
+        """Create the session table once, instead of on every save."""
+        if self._db_initialized:
+            return True
+
+        try:
+            with self._db_cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS cloud_user_sessions (
+                        session_id VARCHAR(32) PRIMARY KEY,
+                        username VARCHAR(255) NOT NULL,
+                        email VARCHAR(255) NOT NULL,
+                        role VARCHAR(50) NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        expires_at TIMESTAMP NOT NULL,
+                        session_data JSONB,
+                        last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                # Serves the per-user "latest session" lookup in _load_database
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_cloud_sessions_user_access
+                    ON cloud_user_sessions (username, last_accessed DESC)
+                """)
+                # Serves the expiry sweep in cleanup_expired_sessions
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_cloud_sessions_expires
+                    ON cloud_user_sessions (expires_at)
+                """)
+            self._db_initialized = True
+
+        except Exception as e:
+            logger.error(f"Database session table init failed: {e}")
+
+        return self._db_initialized
+
+    def _prepare_statements(self, cursor) -> None:
+        """PREPARE the hot session statements once per pooled connection."""
+        conn = cursor.connection
+        if conn in self._prepared_conns:
+            return
+
+        cursor.execute("""
+            PREPARE save_cloud_session
+            (VARCHAR, VARCHAR, VARCHAR, VARCHAR, TIMESTAMP, JSONB, TIMESTAMP) AS
+            INSERT INTO cloud_user_sessions
+            (session_id, username, email, role, expires_at, session_data, last_accessed)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            ON CONFLICT (session_id)
+            DO UPDATE SET
+                expires_at = EXCLUDED.expires_at,
+                session_data = EXCLUDED.session_data,
+                last_accessed = CURRENT_TIMESTAMP
+        """)
+        cursor.execute("""
+            PREPARE cleanup_cloud_sessions AS
+            DELETE FROM cloud_user_sessions WHERE expires_at < CURRENT_TIMESTAMP
+        """)
+        self._prepared_conns.add(conn)
+
     def _save_database(self, session_data: Dict[str, Any]) -> bool:
         """Save session to database."""
-        if not self.db_pool:
+        if not self.db_pool or not self._init_database():
             return False
 
         try:
-            conn = self.db_pool.getconn()
-            cursor = conn.cursor()
-
-            # Create table if not exists
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cloud_user_sessions (
-                    session_id VARCHAR(32) PRIMARY KEY,
-                    username VARCHAR(255) NOT NULL,
-                    email VARCHAR(255) NOT NULL,
-                    role VARCHAR(50) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL,
-                    session_data JSONB,
-                    last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
             expires_at = datetime.fromisoformat(session_data["expires_at"])
 
-            cursor.execute("""
-                INSERT INTO cloud_user_sessions 
-                (session_id, username, email, role, expires_at, session_data, last_accessed)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (session_id) 
-                DO UPDATE SET 
-                    expires_at = EXCLUDED.expires_at,
-                    session_data = EXCLUDED.session_data,
-                    last_accessed = CURRENT_TIMESTAMP
-            """, (
-                session_data["session_id"],
-                session_data["username"],
-                session_data["email"],
-                session_data["role"],
-                expires_at,
-                json.dumps(session_data),
-                datetime.now()
-            ))
-
-            conn.commit()
-            cursor.close()
-            self.db_pool.putconn(conn)
+            with self._db_cursor() as cursor:
+                self._prepare_statements(cursor)
+                cursor.execute("""
+                    EXECUTE save_cloud_session (%s, %s, %s, %s, %s, %s, %s)
+                """, (
+                    session_data["session_id"],
+                    session_data["username"],
+                    session_data["email"],
+                    session_data["role"],
+                    expires_at,
+                    orjson.dumps(session_data).decode(),
+                    datetime.now()
+                ))
             return True
 
         except Exception as e:
             logger.error(f"Database save failed: {e}")
-            if 'conn' in locals():
-                try:
-                    conn.rollback()
-                    cursor.close()
-                    self.db_pool.putconn(conn)
-                except:
-                    pass
             return False
 
     def _load_database(self) -> Optional[Dict[str, Any]]:
@@ -444,33 +483,25 @@ class CloudSessionStorage:
             if not username:
                 return None
 
-            conn = self.db_pool.getconn()
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT session_data, expires_at 
-                FROM cloud_user_sessions 
-                WHERE username = %s AND expires_at > CURRENT_TIMESTAMP 
-                ORDER BY last_accessed DESC 
-                LIMIT 1
-            """, (username,))
-
-            result = cursor.fetchone()
-            cursor.close()
-            self.db_pool.putconn(conn)
+            with self._db_cursor() as cursor:
+                cursor.execute("""
+                    SELECT session_data, expires_at
+                    FROM cloud_user_sessions
+                    WHERE username = %s AND expires_at > CURRENT_TIMESTAMP
+                    ORDER BY last_accessed DESC
+                    LIMIT 1
+                """, (username,))
+                result = cursor.fetchone()
 
             if result:
-                session_data_str, expires_at = result
-                return json.loads(session_data_str)
+                session_data, expires_at = result
+                # psycopg2 already decodes JSONB columns into dicts
+                if isinstance(session_data, dict):
+                    return session_data
+                return orjson.loads(session_data)
 
         except Exception as e:
             logger.error(f"Database load failed: {e}")
-            if 'conn' in locals():
-                try:
-                    cursor.close()
-                    self.db_pool.putconn(conn)
-                except:
-                    pass
         return None
 
     def _clear_database(self, username: str) -> bool:
@@ -479,67 +510,56 @@ class CloudSessionStorage:
             return False
 
         try:
-            conn = self.db_pool.getconn()
-            cursor = conn.cursor()
-
-            cursor.execute(
-                "DELETE FROM cloud_user_sessions WHERE username = %s", (username,))
-
-            conn.commit()
-            cursor.close()
-            self.db_pool.putconn(conn)
+            with self._db_cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM cloud_user_sessions WHERE username = %s", (username,))
             return True
 
         except Exception as e:
             logger.error(f"Database clear failed: {e}")
-            if 'conn' in locals():
-                try:
-                    conn.rollback()
-                    cursor.close()
-                    self.db_pool.putconn(conn)
-                except:
-                    pass
             return False
 
     # Session State Implementation
     def _save_session_state(self, session_data: Dict[str, Any]) -> None:
         """Save session to Streamlit session state."""
-        st.session_state.username = session_data.get("username", "")
-        st.session_state.useremail = session_data.get("email", "")
-        st.session_state.role = session_data.get("role", "")
-        st.session_state.signout = session_data.get("signout", True)
-        st.session_state.session_id = session_data.get("session_id", "")
+        st.session_state.update({
+            "username": session_data.get("username", ""),
+            "useremail": session_data.get("email", ""),
+            "role": session_data.get("role", ""),
+            "signout": session_data.get("signout", True),
+            "session_id": session_data.get("session_id", ""),
+        })
 
     def _load_session_state(self) -> Optional[Dict[str, Any]]:
         """Load session from Streamlit session state."""
         username = st.session_state.get("username", "")
         if username and not st.session_state.get("signout", True):
+            now = datetime.now()
             return {
                 "username": username,
                 "email": st.session_state.get("useremail", ""),
                 "role": st.session_state.get("role", ""),
                 "signout": st.session_state.get("signout", True),
                 "session_id": st.session_state.get("session_id", ""),
-                "timestamp": datetime.now().isoformat(),
-                "expires_at": (datetime.now() + self.session_timeout).isoformat()
+                "timestamp": now.isoformat(),
+                "expires_at": (now + self.session_timeout).isoformat()
             }
         return None
 
     def _clear_session_state(self) -> None:
         """Clear Streamlit session state."""
-        st.session_state.username = ""
-        st.session_state.useremail = ""
-        st.session_state.role = ""
-        st.session_state.signout = True
-        if "session_id" in st.session_state:
-            del st.session_state.session_id
+        st.session_state.update({
+            "username": "",
+            "useremail": "",
+            "role": "",
+            "signout": True,
+        })
+        st.session_state.pop("session_id", None)
 
     # Utility methods
     def _generate_session_id(self, username: str) -> str:
-        """Generate unique session ID."""
-        timestamp = str(datetime.now().timestamp())
-        unique_string = f"{username}_{timestamp}_{uuid.uuid4()}"
-        return hashlib.sha256(unique_string.encode()).hexdigest()[:32]
+        """Generate unique session ID (128 random bits, 32 hex chars)."""
+        return uuid.uuid4().hex
 
     def _is_session_valid(self, session_data: Dict[str, Any]) -> bool:
         """Check if session data is valid and not expired."""
@@ -550,11 +570,16 @@ class CloudSessionStorage:
             if session_data.get("signout", True):
                 return False
 
-            # Check expiration
+            # Check expiration. Our own "YYYY-MM-DDTHH:MM:SS[.ffffff]" stamps
+            # sort chronologically as strings, so skip the datetime parse
             expires_at_str = session_data.get("expires_at")
             if expires_at_str:
-                expires_at = datetime.fromisoformat(expires_at_str)
-                if datetime.now() > expires_at:
+                if len(expires_at_str) in (19, 26) and expires_at_str[10:11] == "T":
+                    expired = expires_at_str < datetime.now().isoformat()
+                else:
+                    expired = datetime.now() > datetime.fromisoformat(
+                        expires_at_str)
+                if expired:
                     logger.info("Session expired")
                     return False
 
@@ -566,11 +591,7 @@ class CloudSessionStorage:
 
     def _update_session_state(self, session_data: Dict[str, Any]) -> None:
         """Update Streamlit session state with loaded session data."""
-        st.session_state.username = session_data.get("username", "")
-        st.session_state.useremail = session_data.get("email", "")
-        st.session_state.role = session_data.get("role", "")
-        st.session_state.signout = session_data.get("signout", True)
-        st.session_state.session_id = session_data.get("session_id", "")
+        self._save_session_state(session_data)
 
     def _resave_to_persistent_storage(self, session_data: Dict[str, Any]) -> None:
         """Re-save session data to persistent storage methods."""
@@ -606,20 +627,14 @@ class CloudSessionStorage:
 
     def cleanup_expired_sessions(self) -> None:
         """Clean up expired sessions from database."""
-        if not self.db_pool:
+        if not self.db_pool or not self._init_database():
             return
 
         try:
-            conn = self.db_pool.getconn()
-            cursor = conn.cursor()
-
-            cursor.execute(
-                "DELETE FROM cloud_user_sessions WHERE expires_at < CURRENT_TIMESTAMP")
-
-            deleted_count = cursor.rowcount
-            conn.commit()
-            cursor.close()
-            self.db_pool.putconn(conn)
+            with self._db_cursor() as cursor:
+                self._prepare_statements(cursor)
+                cursor.execute("EXECUTE cleanup_cloud_sessions")
+                deleted_count = cursor.rowcount
 
             if deleted_count > 0:
                 logger.info(
@@ -627,13 +642,6 @@ class CloudSessionStorage:
 
         except Exception as e:
             logger.error(f"Failed to cleanup expired cloud sessions: {e}")
-            if 'conn' in locals():
-                try:
-                    conn.rollback()
-                    cursor.close()
-                    self.db_pool.putconn(conn)
-                except:
-                    pass
 
 
 # Global instance
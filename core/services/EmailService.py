@@ -3,6 +3,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import streamlit as st
 from datetime import datetime
+from typing import Optional
 
 
 class EmailService:
@@ -12,10 +13,36 @@ class EmailService:
         self.smtp_username = smtp_username
         self.smtp_password = smtp_password
 
+    def is_configured(self):
+        return all([self.smtp_server, self.smtp_port, self.smtp_username, self.smtp_password])
+
+    def deliver(self, recipient, subject, body):
+        """
+        Kirim email lewat SMTP tanpa umpan balik UI Streamlit.
+
+        Aman dipanggil dari thread latar belakang; error SMTP diteruskan
+        ke pemanggil.
+        """
+        if not self.is_configured():
+            raise ValueError("SMTP configuration is incomplete")
+
+        # Membuat pesan email
+        msg = MIMEMultipart()
+        msg['From'] = self.smtp_username
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'html'))
+
+        # Mengirim email menggunakan SMTP
+        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            server.starttls()
+            server.login(self.smtp_username, self.smtp_password)
+            server.sendmail(self.smtp_username, recipient, msg.as_string())
+
     def send_email(self, recipient, subject, body):
         try:
             # Validasi konfigurasi email
-            if not all([self.smtp_server, self.smtp_port, self.smtp_username, self.smtp_password]):
+            if not self.is_configured():
                 st.error(
                     "❌ Konfigurasi email tidak lengkap. Hubungi administrator.")
                 return False
@@ -24,23 +51,7 @@ class EmailService:
             st.info(
                 f"🔄 Mengirim email ke {recipient} menggunakan {self.smtp_server}:{self.smtp_port}")
 
-            # Membuat pesan email
-            msg = MIMEMultipart()
-            msg['From'] = self.smtp_username
-            msg['To'] = recipient
-            msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'html'))
-
-            # Mengirim email menggunakan SMTP
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                st.info("🔄 Memulai koneksi STARTTLS...")
-                server.starttls()
-
-                st.info("🔄 Melakukan autentikasi...")
-                server.login(self.smtp_username, self.smtp_password)
-
-                st.info("🔄 Mengirim email...")
-                server.sendmail(self.smtp_username, recipient, msg.as_string())
+            self.deliver(recipient, subject, body)
 
             st.success("✅ Email berhasil dikirim!")
             return True
@@ -139,3 +150,21 @@ class EmailService:
         </html>
         """
         self.send_email(recipient, subject, body)
+
+
+# Global email service instance, shared by every session
+_email_service: Optional[EmailService] = None
+
+
+def get_email_service() -> EmailService:
+    """Get or create the global email service from the [smtp] secrets."""
+    global _email_service
+    if _email_service is None:
+        smtp = st.secrets["smtp"]
+        _email_service = EmailService(
+            smtp_server=smtp["server"],
+            smtp_port=smtp["port"],
+            smtp_username=smtp["username"],
+            smtp_password=smtp["password"]
+        )
+    return _email_service
@@ -23,7 +23,7 @@ class RAGService:
     including PDF processing, embedding generation, and database interactions.
     """
 
-    def __init__(self, db_pool: pool.SimpleConnectionPool, storage_client: SupabaseClient):
+    def __init__(self, db_pool: pool.ThreadedConnectionPool, storage_client: SupabaseClient):
         """
         Initializes the RAGService.
 
@@ -311,8 +311,9 @@ class RAGService:
         """Displays a preview of the uploaded PDF."""
         if uploaded_file:
             try:
+                # getbuffer() exposes the upload without copying it first
                 base64_pdf = base64.b64encode(
-                    uploaded_file.getvalue()).decode('utf-8')
+                    uploaded_file.getbuffer()).decode('utf-8')
                 # PDF preview styling is now handled by external CSS
                 pdf_display = f'<div class="pdf-preview-container"><iframe src="data:application/pdf;base64,{base64_pdf}" width="100%" height="600" type="application/pdf"></iframe></div>'
                 st.markdown(pdf_display, unsafe_allow_html=True)
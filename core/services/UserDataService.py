@@ -1,52 +1,78 @@
 from datetime import datetime, timedelta
 import pandas as pd
+import streamlit as st
 import plotly.graph_objects as go
 from firebase_admin import firestore
 
+# Fields shown on the admin verification page
+PENDING_USER_FIELDS = ["username", "email",
+                       "created_at", "email_verified", "otp_verified_at"]
+VERIFIED_USER_FIELDS = ["username", "email",
+                        "status", "created_at", "verification_time"]
+
+# Firestore rejects a WriteBatch with more than 500 writes
+MAX_BATCH_WRITES = 500
+
+
+def _as_key(fields):
+    return tuple(fields) if fields is not None else None
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_users(_firestore, status, fields):
+    """
+    Cached query for employee users, shared by every admin session.
+    status=None returns employees of any status. Cleared by verify_users().
+    """
+    # Tambahkan filter untuk role (employee) dan status bila ada
+    query = _firestore.collection("users").where("role", "==", "Employee")
+    if status is not None:
+        query = query.where("status", "==", status)
+    if fields is not None:
+        query = query.select(list(fields))
+    docs = query.stream()
+
+    # Bila ada projection, kolomnya sudah diketahui; baris dialirkan langsung
+    # dari stream Firestore ke pandas tanpa list dict perantara
+    columns = None
+    if fields is not None:
+        columns = ["UID", *fields]
+    rows = ({**doc.to_dict(), "UID": doc.id} for doc in docs)
+
+    # Kembalikan hasil sebagai DataFrame
+    return pd.DataFrame.from_records(rows, columns=columns)
+
 
 class UserDataService:
     def __init__(self, firestore):
         self.fs = firestore
 
     # Fungsi untuk mendapatkan pengguna yang belum terverifikasi
-    def get_users(self, status):
-        users_ref = self.fs.collection("users")
-
-        # Tambahkan filter untuk status dan role (employee)
-        query = users_ref.where("status", "==", status).where(
-            "role", "==", "Employee")
-        docs = query.stream()
+    def get_users(self, status, fields=None):
+        """
+        Get employee users with the given status.
 
-        users_list = []
-        for doc in docs:
-            user_data = doc.to_dict()
-            user_data["UID"] = doc.id
-            users_list.append(user_data)
+        Args:
+            status: User status to filter on ('Pending' or 'Verified').
+            fields: Optional list of document fields to fetch. Firestore then
+                sends only these fields; pass [] to fetch just the IDs.
 
-        # Kembalikan hasil sebagai DataFrame
-        return pd.DataFrame(users_list)
+        Returns:
+            pandas.DataFrame: One row per user, with the document ID as 'UID'
+        """
+        return _fetch_users(self.fs, status, _as_key(fields))
 
-    def get_all_employee_users(self):
+    def get_all_employee_users(self, fields=None):
         """
         Get all users with role 'Employee' regardless of status.
 
+        Args:
+            fields: Optional list of document fields to fetch (see get_users).
+
         Returns:
             pandas.DataFrame: DataFrame containing all employee users
         """
-        users_ref = self.fs.collection("users")
-
-        # Filter only by role (employee), not by status
-        query = users_ref.where("role", "==", "Employee")
-        docs = query.stream()
-
-        users_list = []
-        for doc in docs:
-            user_data = doc.to_dict()
-            user_data["UID"] = doc.id
-            users_list.append(user_data)
-
-        # Kembalikan hasil sebagai DataFrame
-        return pd.DataFrame(users_list)
+        return _fetch_users(self.fs, None, _as_key(fields))
 
     def get_employee_attendance(self):
         attendance_ref = self.fs.collection("employee attendance")
@@ -147,10 +173,54 @@ class UserDataService:
                 'status': 'Verified',
                 'verification_time': datetime.now().strftime("%S:%M:%H %d-%m-%Y")
             })
+            _fetch_users.clear()
             return "User verified successfully."
         except Exception as e:
             return f"Error verifying user: {e}"
 
+    def verify_users(self, uids: list) -> dict:
+        """
+        Verifies several users at once: one batched read to check which
+        users exist, then a single WriteBatch commit for all the updates.
+
+        Args:
+            uids: The UIDs of the users to verify.
+
+        Returns:
+            A dict mapping each UID to a status message, like verify_user.
+        """
+        refs = [self.fs.collection('users').document(uid) for uid in uids if uid]
+        if not refs:
+            return {}
+
+        results = {}
+        try:
+            existing = {doc.id for doc in self.fs.get_all(refs, field_paths=['status'])
+                        if doc.exists}
+            verification_time = datetime.now().strftime("%S:%M:%H %d-%m-%Y")
+
+            # Satu batch Firestore maksimal 500 operasi tulis
+            for start in range(0, len(refs), MAX_BATCH_WRITES):
+                chunk = refs[start:start + MAX_BATCH_WRITES]
+                batch = self.fs.batch()
+                for user_ref in chunk:
+                    if user_ref.id in existing:
+                        batch.update(user_ref, {
+                            'status': 'Verified',
+                            'verification_time': verification_time
+                        })
+                batch.commit()
+                for user_ref in chunk:
+                    results[user_ref.id] = ("User verified successfully." if user_ref.id in existing
+                                            else f"Error: User with UID '{user_ref.id}' not found.")
+        except Exception as e:
+            for user_ref in refs:
+                results.setdefault(user_ref.id, f"Error verifying user: {e}")
+        finally:
+            # Daftar pending/verified berubah, jangan tampilkan cache lama
+            _fetch_users.clear()
+        return results
+
     def plot_daily_login_logout_totals(self, daily_totals, plot_start_date: datetime = None, plot_end_date: datetime = None):  # MODIFIED
         if plot_end_date is None:
             plot_end_date = datetime.now()
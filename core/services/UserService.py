@@ -2,12 +2,13 @@
 
 import random
 import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import logging
 import streamlit as st
 from firebase_admin import exceptions
-import requests
+import httpx
 import re
 import dns.resolver
 
@@ -16,6 +17,68 @@ from core.utils.cookies import save_user_to_cookie, clear_user_cookie
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Precompiled input patterns (validation runs on every form submit)
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_]+$')
+
+IDENTITY_TOOLKIT_ORIGIN = "https://identitytoolkit.googleapis.com"
+SIGN_IN_URL = f"{IDENTITY_TOOLKIT_ORIGIN}/v1/accounts:signInWithPassword"
+
+# Keep-alive HTTP/2 client for the Firebase Identity Toolkit REST API, so
+# repeated logins reuse one multiplexed TLS connection instead of a new handshake
+_HTTP_CLIENT = httpx.Client(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=120.0))
+
+# Shared worker pool for independent, blocking Firebase calls
+_FIREBASE_POOL = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="firebase")
+
+# SMTP sends take seconds; run them off the script thread
+_MAIL_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mail")
+
+
+def _deliver_in_background(email_service, recipient: str, subject: str, body: str) -> None:
+    """Send an email from a worker thread (no Streamlit context, so log only)."""
+    try:
+        email_service.deliver(recipient, subject, body)
+        logger.info(f"Email '{subject}' delivered to {recipient}")
+    except Exception as e:
+        logger.error(f"Background email to {recipient} failed: {e}")
+
+
+_prewarm_started = False
+
+
+def _prewarm_identity_toolkit() -> None:
+    """
+    Open the Identity Toolkit TLS connection once per process, in the
+    background, so the first login does not pay the handshake.
+    """
+    global _prewarm_started
+    if _prewarm_started:
+        return
+    _prewarm_started = True
+
+    def _head() -> None:
+        try:
+            _HTTP_CLIENT.head(IDENTITY_TOOLKIT_ORIGIN, timeout=2.0)
+        except httpx.HTTPError as e:
+            logger.debug(f"Identity Toolkit pre-warm failed: {e}")
+
+    _FIREBASE_POOL.submit(_head)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_user_profile(_firestore, uid: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the users/{uid} document, memoized briefly to skip repeat round trips.
+    login() evicts entries that are missing or not yet Verified.
+    """
+    user_doc = _firestore.collection('users').document(uid).get()
+    return user_doc.to_dict() if user_doc.exists else None
+
 
 class UserServiceError(Exception):
     """Custom exception for user service errors."""
@@ -58,6 +121,9 @@ class UserService:
         self.auth = auth
         self.firebase_api = firebase_api
         self.email_service = email_service
+        # Built once; verify_password runs on every login attempt
+        self._sign_in_url = f"{SIGN_IN_URL}?key={firebase_api}"
+        _prewarm_identity_toolkit()
 
     def _validate_login_input(self, email: str, password: str) -> None:
         """Validate login input parameters."""
@@ -65,7 +131,7 @@ class UserService:
             raise ValidationError("Email and password are required")
 
         # Basic email format validation
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        if not EMAIL_PATTERN.match(email):
             raise ValidationError("Invalid email format")
 
         if len(password) < 6:
@@ -83,12 +149,12 @@ class UserService:
         if len(username) < 3 or len(username) > 30:
             raise ValidationError("Username must be 3-30 characters")
 
-        if not re.match(r'^[a-zA-Z0-9_]+$', username):
+        if not USERNAME_PATTERN.match(username):
             raise ValidationError(
                 "Username can only contain letters, numbers, and underscores")
 
         # Email format validation
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        if not EMAIL_PATTERN.match(email):
             raise ValidationError("Invalid email format")
 
         # Password validation
@@ -114,11 +180,13 @@ class UserService:
             email = user.email
             role = user_data['role']
 
-            # Set session state
-            st.session_state.username = username
-            st.session_state.useremail = email
-            st.session_state.role = role
-            st.session_state.signout = False
+            # Set session state in one update call
+            st.session_state.update({
+                "username": username,
+                "useremail": email,
+                "role": role,
+                "signout": False,
+            })
 
             logger.info(
                 f"Session state set - username: {username}, role: {role}, signout: False")
@@ -196,18 +264,26 @@ class UserService:
                 st.warning("Invalid email or password")
                 return
 
-            user = self.auth.get_user_by_email(email)
+            # The sign-in response already carries the uid, so the Auth
+            # lookup and the Firestore profile fetch can overlap
+            user_future = _FIREBASE_POOL.submit(
+                self.auth.get_user_by_email, email)
+            user_doc_data = _get_user_profile(self.fs, user_data['localId'])
+            if user_doc_data is None or user_doc_data.get("status") != "Verified":
+                # Only verified profiles stay memoized, so a user the admin
+                # verifies (or a profile created) meanwhile is seen on the next try
+                _get_user_profile.clear(self.fs, user_data['localId'])
+            user = user_future.result()
+
             if not user.email_verified:
                 st.warning("Email not verified. Please check your inbox.")
                 return
 
             # Validate user in Firestore
-            user_doc = self.fs.collection('users').document(user.uid).get()
-            if not user_doc.exists:
+            if user_doc_data is None:
                 st.warning("User data not found.")
                 return
 
-            user_doc_data = user_doc.to_dict()
             if user_doc_data.get("status") != "Verified":
                 st.warning("Your account is not verified by admin yet.")
                 return
@@ -278,10 +354,12 @@ class UserService:
                     f"Error clearing legacy session storage service: {e}")
 
             # Clear session state
-            st.session_state.signout = True
-            st.session_state.username = ''
-            st.session_state.useremail = ''
-            st.session_state.role = ''
+            st.session_state.update({
+                "signout": True,
+                "username": '',
+                "useremail": '',
+                "role": '',
+            })
 
             logger.info("User logged out successfully")
 
@@ -309,21 +387,28 @@ class UserService:
             self._validate_signup_input(
                 username, email, password, confirm_password)
 
+            # The username (Firestore) and email (Auth) checks are independent,
+            # so both round trips are issued at once. Only existence matters;
+            # an empty select() is sent as a document-name-only projection
+            username_query = self.fs.collection('users').where(
+                'username', '==', username).select([]).limit(1)
+            existing_users_future = _FIREBASE_POOL.submit(username_query.get)
+            existing_user_future = _FIREBASE_POOL.submit(
+                self.auth.get_user_by_email, email)
+
             # Check if username already exists in Firestore
-            existing_users = self.fs.collection('users').where(
-                'username', '==', username).limit(1).get()
-            if existing_users:
+            if existing_users_future.result():
                 st.warning("Username already taken. Please choose another.")
                 return
 
             # Check if email already exists in Firebase Auth
             try:
-                existing_user = self.auth.get_user_by_email(email)
+                existing_user = existing_user_future.result()
                 if existing_user:
                     st.warning(
                         "Email already registered. Please use a different email or try logging in.")
                     return
-            except exceptions.UserNotFoundError:
+            except exceptions.NotFoundError:
                 # This is good - email doesn't exist yet
                 pass
 
@@ -362,8 +447,6 @@ class UserService:
 
         except ValidationError as e:
             st.warning(str(e))
-        except exceptions.AlreadyExistsError:
-            st.warning("Email or username already taken.")
         except Exception as e:
             logger.error(f"Error during signup: {e}")
             st.error(f"An error occurred: {e}")
@@ -406,9 +489,14 @@ class UserService:
                 del st.session_state.pending_registration[email]
                 return
 
+            # Email sudah terverifikasi lewat OTP, jadi langsung ditandai saat
+            # create_user (tanpa RPC update_user tambahan). UserRecord yang
+            # dikembalikan dipakai ulang, tidak perlu lookup get_user_by_email.
+            user = self.auth.create_user(
+                email=email, password=password, uid=username, email_verified=True)
+
             # Save user data to Firestore
-            self.auth.create_user(email=email, password=password, uid=username)
-            user_ref = self.fs.collection("users").document(username)
+            user_ref = self.fs.collection("users").document(user.uid)
             user_data = {
                 "username": username,
                 "email": email,
@@ -454,14 +542,13 @@ class UserService:
             AuthenticationError: If verification fails
         """
         try:
-            url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={self.firebase_api}"
             data = {
                 "email": email,
                 "password": password,
                 "returnSecureToken": True
             }
 
-            response = requests.post(url, json=data)
+            response = _HTTP_CLIENT.post(self._sign_in_url, json=data)
             response_data = response.json()
 
             if response.status_code == 200:
@@ -515,13 +602,16 @@ class UserService:
             ICONNET Team
             """
 
-            success = self.email_service.send_email(email, subject, body)
-
-            if success:
-                return True, f"Verification code sent to {email}. Please check your inbox."
-            else:
+            if not self.email_service.is_configured():
                 return False, "Failed to send verification email. Please try again."
 
+            # Deliver in the background so the form responds right away;
+            # the user can resend the code if it never arrives
+            _MAIL_POOL.submit(_deliver_in_background,
+                              self.email_service, email, subject, body)
+
+            return True, f"Verification code sent to {email}. Please check your inbox."
+
         except Exception as e:
             logger.error(f"Error sending OTP to {email}: {e}")
             return False, f"Error sending verification email: {e}"
@@ -27,7 +27,7 @@ def _initialize_embeddings() -> GoogleGenerativeAIEmbeddings:
 
 def _fetch_similar_documents(
     query_embedding: List[float],
-    db_conn: pool.SimpleConnectionPool,
+    db_conn: pool.ThreadedConnectionPool,
     k: int
 ) -> List[tuple]:
     """
@@ -35,7 +35,7 @@ def _fetch_similar_documents(
 
     Args:
         query_embedding (List[float]): Embedding vector of the user's query.
-        db_conn (SimpleConnectionPool): Database connection pool instance.
+        db_conn (ThreadedConnectionPool): Database connection pool instance.
         k (int): Number of most relevant documents to retrieve.
 
     Returns:
@@ -79,7 +79,7 @@ def _parse_metadata(metadata_raw: Any) -> Dict[str, Any]:
 
 def _search_similar_documents_in_db(
     query: str,
-    db_pool: pool.SimpleConnectionPool,
+    db_pool: pool.ThreadedConnectionPool,
     k: int
 ) -> List[Dict[str, Any]]:
     """
@@ -87,7 +87,7 @@ def _search_similar_documents_in_db(
 
     Args:
         query (str): User's input question or topic.
-        db_pool (SimpleConnectionPool): Database connection pool.
+        db_pool (ThreadedConnectionPool): Database connection pool.
         k (int): Number of top documents to retrieve.
 
     Returns:
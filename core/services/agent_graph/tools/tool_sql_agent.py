@@ -15,7 +15,7 @@ from ....utils.database import execute_with_retry
 # =====================
 
 
-def _get_db_schema(db_pool: pool.SimpleConnectionPool) -> Optional[Dict[str, List[str]]]:
+def _get_db_schema(db_pool: pool.ThreadedConnectionPool) -> Optional[Dict[str, List[str]]]:
     """
     Mengambil skema (nama tabel, kolom, tipe data, dan DESKRIPSI) dari database,
     diperkaya dengan pengetahuan kontekstual.
@@ -166,7 +166,7 @@ def _generate_sql_query_from_question(schema: Dict[str, Dict[str, any]], user_qu
         return None
 
 
-def _execute_sql_query(query: str, db_pool: pool.SimpleConnectionPool) -> Tuple[Optional[List[Tuple]], Optional[List[str]], Optional[str]]:
+def _execute_sql_query(query: str, db_pool: pool.ThreadedConnectionPool) -> Tuple[Optional[List[Tuple]], Optional[List[str]], Optional[str]]:
     """
     Executes an SQL query and returns results and column names.
     """
@@ -22,7 +22,7 @@ _schema_cache = None
 # =====================
 
 
-def _get_db_schema_cached(db_pool: pool.SimpleConnectionPool) -> Optional[Dict[str, List[str]]]:
+def _get_db_schema_cached(db_pool: pool.ThreadedConnectionPool) -> Optional[Dict[str, List[str]]]:
     """
     Mengambil skema database dengan caching untuk optimasi token.
     Hanya mengambil kolom yang essential dan menggunakan cache.
@@ -132,7 +132,7 @@ Query:"""
         return None
 
 
-def _execute_sql_query(query: str, db_pool: pool.SimpleConnectionPool) -> Tuple[Optional[List[Tuple]], Optional[List[str]], Optional[str]]:
+def _execute_sql_query(query: str, db_pool: pool.ThreadedConnectionPool) -> Tuple[Optional[List[Tuple]], Optional[List[str]], Optional[str]]:
     """
     Executes an SQL query and returns results and column names.
     """
@@ -156,7 +156,7 @@ def get_supabase_config() -> dict:
 
 
 @st.cache_resource
-def connect_db() -> Tuple[Optional[pool.SimpleConnectionPool], Optional[object]]:
+def connect_db() -> Tuple[Optional[pool.ThreadedConnectionPool], Optional[object]]:
     """
     Create PostgreSQL connection pool and Supabase client.
 
@@ -180,7 +180,9 @@ def connect_db() -> Tuple[Optional[pool.SimpleConnectionPool], Optional[object]]
                     'options': '-c statement_timeout=30000'  # 30 second query timeout
                 }
 
-                db_pool = pool.SimpleConnectionPool(
+                # Pool ini dipakai bersama oleh semua thread script Streamlit
+                # (satu thread per sesi browser), jadi harus thread-safe
+                db_pool = pool.ThreadedConnectionPool(
                     minconn=1,
                     maxconn=5,
                     **enhanced_db_config
@@ -244,7 +246,7 @@ def connect_db() -> Tuple[Optional[pool.SimpleConnectionPool], Optional[object]]
     return db_pool, supabase_client
 
 
-def close_db_pool(db_pool: pool.SimpleConnectionPool) -> None:
+def close_db_pool(db_pool: pool.ThreadedConnectionPool) -> None:
     """
     Safely close the database connection pool.
 
@@ -282,7 +284,7 @@ def is_connection_alive(connection) -> bool:
         return False
 
 
-def get_robust_connection(db_pool: pool.SimpleConnectionPool, max_retries: int = 3):
+def get_robust_connection(db_pool: pool.ThreadedConnectionPool, max_retries: int = 3):
     """
     Get a robust database connection with retry logic.
 
@@ -331,7 +333,7 @@ def get_robust_connection(db_pool: pool.SimpleConnectionPool, max_retries: int =
     raise OperationalError("Unable to get connection after all retries")
 
 
-def execute_with_retry(db_pool: pool.SimpleConnectionPool,
+def execute_with_retry(db_pool: pool.ThreadedConnectionPool,
                        operation: Callable[[Any], Any],
                        max_retries: int = 3) -> Any:
     """
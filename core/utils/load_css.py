@@ -2,6 +2,18 @@ import os
 import streamlit as st
 
 
+@st.cache_data(show_spinner=False)
+def read_css(path: str) -> str:
+    """
+    Membaca isi file CSS sekali lalu menyimpannya di cache.
+
+    Args:
+        path (str): Path ke file CSS.
+    """
+    with open(path) as f:
+        return f.read()
+
+
 def load_custom_css(path: str) -> None:
     """
     Memuat custom CSS dari file yang ditentukan.
@@ -11,8 +23,7 @@ def load_custom_css(path: str) -> None:
     """
     if os.path.exists(path):
         try:
-            with open(path) as f:
-                st.markdown(f"<style>{f.read()}</style>",
-                            unsafe_allow_html=True)
+            st.markdown(f"<style>{read_css(path)}</style>",
+                        unsafe_allow_html=True)
         except Exception as e:
             st.warning(f"Gagal memuat CSS: {e}")
@@ -0,0 +1,22 @@
+import streamlit as st
+from PIL import Image, ImageOps
+
+ICON_PATH = "static/image/icon.png"
+
+
+@st.cache_resource(show_spinner=False)
+def get_page_icon(path: str = ICON_PATH, size: tuple = (40, 50), pad: int = 8) -> Image.Image:
+    """
+    Memuat ikon halaman (resize + padding transparan) sekali per proses.
+
+    Gambar yang dikembalikan dipakai bersama oleh semua sesi, jadi jangan
+    diubah secara in-place.
+
+    Args:
+        path (str): Path ke file ikon.
+        size (tuple): Ukuran ikon setelah resize.
+        pad (int): Lebar padding transparan di sekeliling ikon.
+    """
+    with Image.open(path) as image:
+        logo = image.resize(size)
+    return ImageOps.expand(logo, border=pad, fill=(255, 255, 255, 0))
@@ -4,10 +4,23 @@ from core.services.UserService import UserService
 from core.services.UserDataService import UserDataService
 from streamlit_option_menu import option_menu
 from core import initialize_session_state
-from PIL import Image, ImageOps
+from core.utils.load_css import read_css
+from core.utils.load_image import get_page_icon
 from .views import dashboard, rag, verify_users
 from core.services.RAG import RAGService
 
+# Konfigurasi option_menu statis, dibuat sekali saat import (bukan setiap rerun)
+_SIDEBAR_STYLES = {
+    "container": {"padding": "1px", "background-color": "#E3F2FD"},
+    "menu-title": {"font-size": "24px", "font-weight": "bold", "color": "#546E7A"},
+    "icon": {"color": "#546E7A", "font-size": "18px"},
+    "nav-link": {"color": "#546E7A", "font-size": "18px", "text-align": "left", "margin": "5px"},
+    "nav-link-selected": {"background-color": "#42c2ff", "color": "#FFFFFF", "font-weight": "bold"},
+}
+# Ensure options match the keys used in render_page
+_MENU_OPTIONS = ["Dashboard", "Verify Users", "RAG Management"]
+_MENU_ICONS = ["grid-fill", "person-check-fill", "file-earmark-arrow-up-fill"]
+
 
 class AdminPage:
     """Controller for the Admin section."""
@@ -33,12 +46,8 @@ class AdminPage:
     def configure_page(self):
         """Configures Streamlit page settings."""
         try:
-            logo = Image.open("static/image/icon.png").resize((40, 50))
-            logo_with_padding = ImageOps.expand(
-                logo, border=8, fill=(255, 255, 255, 0)
-            )
             st.set_page_config(page_title="Home Page",
-                               page_icon=logo_with_padding)
+                               page_icon=get_page_icon())
         except st.errors.StreamlitSetPageConfigMustBeFirstCommandError:
             pass
         st.logo("static/image/logo_iconplus.png", size="large")
@@ -46,32 +55,22 @@ class AdminPage:
     def load_css(self, file_path: str):
         """Loads a CSS file into the Streamlit app."""
         try:
-            with open(file_path) as f:
-                st.markdown(f"<style>{f.read()}</style>",
-                            unsafe_allow_html=True)
+            st.markdown(f"<style>{read_css(file_path)}</style>",
+                        unsafe_allow_html=True)
         except FileNotFoundError:
             st.error(f"CSS file not found at: {file_path}")
 
     def render_sidebar(self) -> str:
         """Renders the navigation menu in the sidebar."""
         with st.sidebar:
-            # Ensure options match the keys used in render_page
             selected_option = option_menu(
                 menu_title="Admin Menu",
-                options=["Dashboard", "Verify Users",
-                         "RAG Management"],
-                icons=["grid-fill", "person-check-fill",
-                       "file-earmark-arrow-up-fill"],
+                options=_MENU_OPTIONS,
+                icons=_MENU_ICONS,
                 menu_icon="person-workspace",
                 default_index=0,
                 orientation="vertical",
-                styles={
-                    "container": {"padding": "1px", "background-color": "#E3F2FD"},
-                    "menu-title": {"font-size": "24px", "font-weight": "bold", "color": "#546E7A"},
-                    "icon": {"color": "#546E7A", "font-size": "18px"},
-                    "nav-link": {"color": "#546E7A", "font-size": "18px", "text-align": "left", "margin": "5px"},
-                    "nav-link-selected": {"background-color": "#42c2ff", "color": "#FFFFFF", "font-weight": "bold"},
-                }
+                styles=_SIDEBAR_STYLES
             )
         return selected_option
 
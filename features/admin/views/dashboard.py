@@ -17,12 +17,16 @@ def app(user_data_service: UserDataService):
     st.subheader("Key Metrics")
     col1, col2, col3 = st.columns(3)
     try:
-        pending_users_df = user_data_service.get_users(status='Pending')
-        verified_users_df = user_data_service.get_users(status='Verified')
+        # Only the counts are shown, so fetch document IDs only
+        pending_users_df = user_data_service.get_users(
+            status='Pending', fields=[])
+        verified_users_df = user_data_service.get_users(
+            status='Verified', fields=[])
 
         # Get all employee users regardless of status
         try:
-            all_users_df = user_data_service.get_all_employee_users()
+            all_users_df = user_data_service.get_all_employee_users(
+                fields=[])
             col1.metric("Total Registered Users", len(all_users_df))
         except Exception as e:
             col1.metric("Total Registered Users", "Error")
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from core.services.UserDataService import UserDataService  # Import untuk type hinting
+from core.services.UserDataService import UserDataService, PENDING_USER_FIELDS, VERIFIED_USER_FIELDS
 
 
 def app(user_data_service: UserDataService):
@@ -17,7 +17,8 @@ def app(user_data_service: UserDataService):
     try:
         # --- Section: Users Pending Verification ---
         st.subheader("⏳ Users Pending Verification")
-        unverified_users_df = user_data_service.get_users(status='Pending')
+        unverified_users_df = user_data_service.get_users(
+            status='Pending', fields=PENDING_USER_FIELDS)
 
         if not unverified_users_df.empty:
             # Display relevant columns including email verification status
@@ -62,14 +63,18 @@ def app(user_data_service: UserDataService):
                     uid_map = pd.Series(
                         unverified_users_df.UID.values, index=unverified_users_df.email).to_dict()
                     with st.spinner("Verifying users..."):
+                        # Verify all selected users in one batched write
+                        messages = user_data_service.verify_users(
+                            [uid_map[email] for email in selected_emails if uid_map.get(email)])
                         for email in selected_emails:
                             uid = uid_map.get(email)
                             if uid:
-                                # Call the service method to verify
-                                message = user_data_service.verify_user(
-                                    uid)  # Assuming verify_user exists
-                                st.success(f"User {email}: {message}")
-                                verified_count += 1
+                                message = messages.get(uid, "")
+                                if message.startswith("Error"):
+                                    st.error(f"User {email}: {message}")
+                                else:
+                                    st.success(f"User {email}: {message}")
+                                    verified_count += 1
                             else:
                                 st.error(
                                     f"Could not find UID for email: {email}")
@@ -83,7 +88,8 @@ def app(user_data_service: UserDataService):
 
         # --- Section: Verified Users ---
         st.subheader("✔️ Verified Users")
-        verified_users_df = user_data_service.get_users(status='Verified')
+        verified_users_df = user_data_service.get_users(
+            status='Verified', fields=VERIFIED_USER_FIELDS)
 
         if not verified_users_df.empty:
             # Prepare DataFrame for display
@@ -2,20 +2,32 @@
 
 import streamlit as st
 import os
-from PIL import Image, ImageOps
+from core.utils.load_image import get_page_icon
 from streamlit_option_menu import option_menu
-# Import views
-from .views import dashboard, search, update_data, chatbot, add_column
 # Import services dan init function
 from core.services.AssetDataService import AssetDataService
 from psycopg2 import pool
 from core.utils.load_css import load_custom_css
 
+# Konfigurasi option_menu statis, dibuat sekali saat import (bukan setiap rerun)
+_SIDEBAR_STYLES = {
+    "container": {"padding": "1px", "background-color": "#E3F2FD"},
+    "menu-title": {"font-size": "24px", "font-weight": "bold", "color": "#546E7A"},
+    "icon": {"color": "#546E7A", "font-size": "18px"},
+    "nav-link": {"color": "#546E7A", "font-size": "18px", "text-align": "left", "margin": "5px"},
+    "nav-link-selected": {"background-color": "#42c2ff", "color": "#FFFFFF", "font-weight": "bold"},
+}
+# Sesuaikan options dan icons jika perlu
+_MENU_OPTIONS = ["Dashboard", "Search Assets",
+                 "Upload Assets", "Chatbot", "Add Column"]
+_MENU_ICONS = ["speedometer2", "search",
+               "cloud-upload", "chat-dots", "pencil-square"]
+
 
 class HomePage:
     """Controller for the Home section."""
 
-    def __init__(self, asset_data_service: AssetDataService, db_pool: pool.SimpleConnectionPool):
+    def __init__(self, asset_data_service: AssetDataService, db_pool: pool.ThreadedConnectionPool):
         """
         Initializes the HomePage controller.
 
@@ -29,11 +41,8 @@ class HomePage:
     def configure_page(self):
         """Configures Streamlit page settings."""
         try:
-            logo = Image.open("static/image/icon.png").resize((40, 50))
-            logo_with_padding = ImageOps.expand(
-                logo, border=8, fill=(255, 255, 255, 0))
             st.set_page_config(page_title="Home Page",
-                               page_icon=logo_with_padding)
+                               page_icon=get_page_icon())
         except st.errors.StreamlitSetPageConfigMustBeFirstCommandError:
             pass
         st.logo("static/image/logo_iconplus.png", size="large")
@@ -41,37 +50,35 @@ class HomePage:
     def render_sidebar(self) -> str:
         """Renders the navigation menu in the sidebar."""
         with st.sidebar:
-            # Sesuaikan options dan icons jika perlu
             selected_option = option_menu(
                 menu_title="Main Menu",
-                options=["Dashboard", "Search Assets", "Upload Assets", "Chatbot",
-                         "Add Column"],                icons=["speedometer2", "search", "cloud-upload", "chat-dots",
-                       "pencil-square"],  # Sesuaikan ikon
+                options=_MENU_OPTIONS,
+                icons=_MENU_ICONS,
                 menu_icon="house-door-fill",  # Ikon menu utama
                 default_index=0,
                 orientation="vertical",
-                styles={
-                    "container": {"padding": "1px", "background-color": "#E3F2FD"},
-                    "menu-title": {"font-size": "24px", "font-weight": "bold", "color": "#546E7A"},
-                    "icon": {"color": "#546E7A", "font-size": "18px"},
-                    "nav-link": {"color": "#546E7A", "font-size": "18px", "text-align": "left", "margin": "5px"},
-                    "nav-link-selected": {"background-color": "#42c2ff", "color": "#FFFFFF", "font-weight": "bold"},
-                }
+                styles=_SIDEBAR_STYLES
             )
         return selected_option
 
     def render_page(self, selected_option: str):
         """Renders the sub-page based on the menu selection."""
-        # Panggil view dengan dependensi yang diperlukan
+        # Panggil view dengan dependensi yang diperlukan. View diimpor saat
+        # dipilih saja, jadi page load tidak ikut memuat LangChain dkk.
         if selected_option == 'Dashboard':
+            from .views import dashboard
             dashboard.app(self.asset_data_service)
         elif selected_option == 'Search Assets':
+            from .views import search
             search.app(self.asset_data_service)
         elif selected_option == 'Upload Assets':
+            from .views import update_data
             update_data.app(self.asset_data_service)
         elif selected_option == 'Chatbot':
+            from .views import chatbot
             chatbot.app()
         elif selected_option == 'Add Column':
+            from .views import add_column
             add_column.app()
 
     def render(self):
@@ -3,7 +3,6 @@ import streamlit as st
 from core.services.AssetDataService import AssetDataService  # Import service
 import pandas as pd
 import logging
-from core.utils.database import connect_db
 from core.services.dynamic_search_helper import get_unified_search_service
 
 # Configure logging
@@ -575,11 +574,7 @@ def export_search_results(df: pd.DataFrame, filename_prefix: str = "search_resul
             return output.read()
         else:
             # Fallback to CSV
-            output = BytesIO()
-            csv_data = df.to_csv(index=False)
-            output.write(csv_data.encode('utf-8'))
-            output.seek(0)
-            return output.read()
+            return df.to_csv(index=False).encode('utf-8')
 
     except Exception as e:
         logger.error(f"Error exporting data: {e}")